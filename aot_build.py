@@ -0,0 +1,29 @@
+"""
+Ahead-of-time compiles the TF-IDF scoring kernel from scorer.py into the sentiment_kernel
+extension module, so API workers start with native code instead of JIT-compiling on boot.
+Run it once at image build time: python aot_build.py
+"""
+import sys
+
+from scorer import _score
+
+try:
+    from numba.pycc import CC
+except ImportError:
+    print("numba.pycc is not available; the API will JIT-compile the kernel instead.")
+    sys.exit(0)
+
+cc = CC("sentiment_kernel")
+cc.verbose = True
+# The kernel never allocates, so skip the NRT runtime (a C++ source that would need g++ to build)
+cc.use_nrt = False
+
+# Same argument order and types as scorer._score: cols, counts, idf, coef, intercept, tf_mode, norm_mode
+cc.export("score", "f8(i8[:], i8[:], f8[:], f8[:], f8, i8, i8)")(getattr(_score, "py_func", _score))
+
+if __name__ == "__main__":
+    try:
+        cc.compile()
+    except Exception as e:
+        # A failed native build must not fail the image: scorer.py falls back to the JIT kernel
+        print(f"AOT build failed ({e}); the API will JIT-compile the kernel instead.")
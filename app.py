@@ -1,58 +1,139 @@
 import os
-import json
+import asyncio
+import contextlib
+import functools
 import logging
+import queue
 import random
-from typing import List, Dict
+import threading
+import time
+from typing import List, Dict, Tuple
 
+import joblib
+import mlflow.artifacts
 import mlflow.sklearn
-from fastapi import FastAPI, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Float
-from sqlalchemy.orm import sessionmaker, Session
+import ijson
+import orjson
+import redis.asyncio as aioredis
+
+from scorer import LinearTextScorer
+from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import insert, select, func, text, Column, Index, Integer, String, Boolean, Float
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.exc import OperationalError
 import logging
 import requests     # Used for the manual Elasticsearch connection
+from requests.adapters import HTTPAdapter
 import datetime     # Used for timestamps
+from contextvars import ContextVar
 
 # --- CONFIGURATION ---
 DB_HOST = os.getenv("DB_HOST")
 DB_USER = os.getenv("POSTGRES_USER")
 DB_PASSWORD = os.getenv("POSTGRES_PASSWORD")
 DB_NAME = os.getenv("POSTGRES_DB")
-SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:5432/{DB_NAME}"
+SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:5432/{DB_NAME}"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))  # per worker process
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # per worker process, on top of DB_POOL_SIZE
+REDIS_HOST = os.getenv("REDIS_HOST")  # Optional: without it /score always aggregates in Postgres
 
 # --- SMART LOG HANDLER (This logic extracts the tags) ---
+# Attributes every LogRecord carries; anything else was passed through "extra"
+_STD_ATTRS = frozenset((
+    "name", "msg", "args", "levelname", "levelno", "pathname",
+    "filename", "module", "exc_info", "exc_text", "stack_info",
+    "lineno", "funcName", "created", "msecs", "relativeCreated",
+    "thread", "threadName", "processName", "process", "message",
+))
+_UTC = datetime.timezone.utc
+
 class SimpleElasticsearchHandler(logging.Handler):
+    # Records are queued by emit() and shipped by a background thread through the _bulk API,
+    # so no log call ever waits on Elasticsearch.
+    FLUSH_INTERVAL = 0.5  # seconds
+    FLUSH_SIZE = 200
+    QUEUE_SIZE = 10000
+    # Circuit breaker: after a failed flush, records are dropped until the cooldown expires
+    BREAKER_COOLDOWN = 30  # seconds, multiplied by the failure streak (capped at 10)
+
     def __init__(self, host, port, index):
         super().__init__()
-        self.url = f"http://{host}:{port}/{index}/_doc"
-        self.headers = {"Content-Type": "application/json"}
+        self.url = f"http://{host}:{port}/{index}/_bulk"
+        self.headers = {"Content-Type": "application/x-ndjson"}
+        self.queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self._skip_until = 0.0
+        self._fail_streak = 0
+        self.flusher = threading.Thread(target=self._flush_loop, name="es-log-flusher", daemon=True)
+        self.flusher.start()
 
     def emit(self, record):
+        if time.monotonic() < self._skip_until:
+            return
         try:
             # Base Payload
             payload = {
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "timestamp": datetime.datetime.fromtimestamp(record.created, _UTC).isoformat(),
                 "level": record.levelname,
                 "message": record.getMessage(), 
                 "logger": record.name
             }
             
             # Add Custom "Extra" Fields (The Important Part)
-            standard_attr = ["name", "msg", "args", "levelname", "levelno", "pathname", 
-                             "filename", "module", "exc_info", "exc_text", "stack_info", 
-                             "lineno", "funcName", "created", "msecs", "relativeCreated", 
-                             "thread", "threadName", "processName", "process", "message"]
-            
             for key, value in record.__dict__.items():
-                if key not in standard_attr and not key.startswith("_"):
+                if key not in _STD_ATTRS and not key.startswith("_"):
                     payload[key] = value
 
-            requests.post(self.url, headers=self.headers, json=payload, timeout=1)
+            # Drops the record (queue.Full) rather than block the request when ES falls behind
+            self.queue.put_nowait(payload)
         except Exception:
             pass
 
+    def _flush_loop(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.FLUSH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._send(batch)
+
+    def flush(self):
+        # Called by logging.shutdown() at exit: ship whatever the background thread has not sent yet
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.FLUSH_SIZE:
+                self._send(batch)
+                batch = []
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch):
+        if time.monotonic() < self._skip_until:
+            return
+        action = orjson.dumps({"index": {}})
+        body = b"".join(action + b"\n" + orjson.dumps(payload, default=str) + b"\n" for payload in batch)
+        try:
+            self.session.post(self.url, headers=self.headers, data=body, timeout=1)
+        except Exception:
+            self._fail_streak += 1
+            self._skip_until = time.monotonic() + self.BREAKER_COOLDOWN * min(self._fail_streak, 10)
+        else:
+            self._fail_streak = 0
+
 # --- LOGGING SETUP ---
 log = logging.getLogger("rotten_potatoes_logger")
 log.setLevel(logging.INFO)
@@ -66,8 +147,19 @@ except Exception as e:
     print(f"WARNING: Could not initialize Elasticsearch logging. Error: {e}")
 
 # --- DB SETUP ---
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# asyncpg keeps DB waits off the event loop; executemany() INSERTs go out as multi-row VALUES pages
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    insertmanyvalues_page_size=1000,
+    # Pool sized for concurrent requests; LIFO keeps the most recently used connections warm
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_use_lifo=True,
+)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 class Movie(Base):
@@ -83,21 +175,115 @@ class MovieReview(Base):
     review = Column(String)
     isPos = Column(Boolean) 
 
-def get_db():
-    db = SessionLocal()
+# /score aggregates by (movie_id, isPos); /reviews reads the newest rows per movie
+Index("ix_movie_reviews_movie_id_ispos", MovieReview.movie_id, MovieReview.isPos)
+Index("ix_movie_reviews_movie_id_rev_desc", MovieReview.movie_id, MovieReview.review_id.desc())
+
+def ensure_indexes(conn):
+    # create_all() skips tables that already exist, so add missing indexes to them explicitly
+    for index in MovieReview.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+
+# One session per HTTP request, looked up through a context variable set by DBSessionMiddleware
+_request_scope = ContextVar("request_scope", default=None)
+ScopedSession = async_scoped_session(SessionLocal, scopefunc=_request_scope.get)
+
+class DBSessionMiddleware:
+    """Plain ASGI middleware that opens a session scope per request and closes it afterwards."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(object())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Closing the session returns the connection to the pool, not to Postgres
+            await ScopedSession.remove()
+            _request_scope.reset(token)
+
+# --- SCORE CACHE ---
+# Running (total, pos) counters per movie, so /score is a single HGETALL instead of an aggregate.
+# Submits only bump counters that already exist; a miss is rebuilt from Postgres on the next read,
+# and the TTL heals any drift from a submit racing that rebuild.
+SCORE_CACHE_TTL = 300  # seconds
+# Circuit breaker, as in SimpleElasticsearchHandler: after a failed call Redis is skipped until the
+# cooldown expires, so a hung Redis costs one timeout per cooldown instead of one per request
+SCORE_CACHE_COOLDOWN = 30  # seconds
+_score_cache_skip_until = 0.0
+_SCORE_INCR_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HINCRBY', KEYS[1], 'total', 1)
+    if ARGV[1] == '1' then
+        redis.call('HINCRBY', KEYS[1], 'pos', 1)
+    end
+end
+"""
+
+# retry=None: newer redis-py retries timeouts by default, multiplying every stall by the retry count
+score_cache = aioredis.Redis(
+    host=REDIS_HOST, port=6379, socket_timeout=0.2, socket_connect_timeout=0.2, retry=None
+) if REDIS_HOST else None
+score_incr = score_cache.register_script(_SCORE_INCR_LUA) if score_cache else None
+
+def score_cache_key(movie_id):
+    return f"score:{movie_id}"
+
+def score_cache_available():
+    return score_cache is not None and time.monotonic() >= _score_cache_skip_until
+
+def trip_score_cache_breaker():
+    global _score_cache_skip_until
+    _score_cache_skip_until = time.monotonic() + SCORE_CACHE_COOLDOWN
+
+async def get_cached_score(movie_id):
+    if not score_cache_available():
+        return None
     try:
-        yield db
-    finally:
-        db.close()
+        cached = await score_cache.hgetall(score_cache_key(movie_id))
+    except Exception as e:
+        trip_score_cache_breaker()
+        log.warning(f"Score cache read failed: {e}")
+        return None
+    if b"total" not in cached:
+        return None
+    return int(cached[b"total"]), int(cached.get(b"pos", 0))
+
+async def set_cached_score(movie_id, total_reviews, positive_count):
+    if not score_cache_available():
+        return
+    key = score_cache_key(movie_id)
+    try:
+        async with score_cache.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"total": total_reviews, "pos": positive_count})
+            pipe.expire(key, SCORE_CACHE_TTL)
+            await pipe.execute()
+    except Exception as e:
+        trip_score_cache_breaker()
+        log.warning(f"Score cache write failed: {e}")
+
+async def bump_cached_score(movie_id, is_positive):
+    if not score_cache_available():
+        return
+    try:
+        await score_incr(keys=[score_cache_key(movie_id)], args=[1 if is_positive else 0])
+    except Exception as e:
+        trip_score_cache_breaker()
+        log.warning(f"Score cache update failed: {e}")
 
 # --- SCHEMAS ---
 class Review(BaseModel):
     text: str
 class MovieData(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: int
     name: str
     description: str
 class MovieReviewData(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     review_id: int
     movie_id: int
     review: str
@@ -111,95 +297,321 @@ class ScoreResponse(BaseModel):
     score: float
 
 # --- APP STARTUP ---
-app = FastAPI(title="Rotten Potatoes Backend API", description="FastAPI, MLflow, and Persistent DB Integration.")
+app = FastAPI(
+    title="Rotten Potatoes Backend API",
+    description="FastAPI, MLflow, and Persistent DB Integration.",
+    # orjson serializes response bodies several times faster than the stdlib encoder
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(DBSessionMiddleware)
 
 # NOTE: This log message is different now ("System Startup" vs "Initializing...")
 log.info("System Startup", extra={"event_type": "LIFECYCLE", "status": "STARTING"})
 
 model = None
+fast_scorer = None
 latest_run_id = "Unknown"
 
+@functools.lru_cache(maxsize=None)
+def index_artifacts(root):
+    """Walks root once with scandir and maps every file name to the paths it appears at."""
+    index = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        index.setdefault(entry.name, []).append(entry.path)
+        except OSError:
+            continue
+    return index
+
+def find_model(root):
+    model_pkl_paths = index_artifacts(root).get("model.pkl", [])
+    return os.path.dirname(model_pkl_paths[0]) if model_pkl_paths else None
+
+MODEL_PATH_CACHE = "/tmp/model_path_cache"
+
+def load_cached_model_path():
+    """Returns the model directory found by a previous start, if it still holds a model.pkl."""
+    try:
+        with open(MODEL_PATH_CACHE, "r") as f:
+            cached = f.read().strip()
+    except OSError:
+        return None
+    if cached and os.path.exists(os.path.join(cached, "model.pkl")):
+        return cached
+    return None
+
+def save_cached_model_path(path):
+    try:
+        with open(MODEL_PATH_CACHE, "w") as f:
+            f.write(path)
+    except OSError as e:
+        log.warning(f"Could not cache model path: {e}")
+
+def load_model_dir(model_dir):
+    # train.py ships a joblib copy next to model.pkl. Memory-mapping it shares only the numpy arrays
+    # (coef_, idf_) between workers through the page cache; the TF-IDF vocabulary_ dict, the bulk of
+    # the model, is still unpickled per worker, and LinearTextScorer's hash arrays are per process too
+    joblib_path = os.path.join(model_dir, "model.joblib")
+    if os.path.exists(joblib_path):
+        return joblib.load(joblib_path, mmap_mode="r")
+    return mlflow.sklearn.load_model(model_dir)
+
+# Written by train.py after each run: {"run_id": ..., "model_uri": ...}
+LATEST_MODEL_FILE = "latest_model.json"
+
+def load_latest_model():
+    """Loads the model train.py last recorded, or returns None so the directory search runs instead."""
+    try:
+        with open(LATEST_MODEL_FILE, "rb") as f:
+            latest = orjson.loads(f.read())
+    except (OSError, ValueError):
+        # Missing, unreadable or truncated pointer
+        return None
+    try:
+        # Resolved to its local directory so load_model_dir can memory-map the joblib copy
+        model_dir = mlflow.artifacts.download_artifacts(artifact_uri=latest["model_uri"])
+        return load_model_dir(model_dir), latest["run_id"]
+    except Exception as e:
+        # e.g. the image was built without the MLflow store the pointer refers to
+        log.warning(f"Latest model pointer unusable: {e}", extra={"event_type": "MODEL_LOAD"})
+        return None
+
 try:
-    search_path = "ml_model"
-    model_uri = None
-    for root, dirs, files in os.walk(search_path):
-        if "model.pkl" in files:
-            model_uri = root
-            log.info(f"Model Found", extra={"event_type": "MODEL_LOAD", "path": model_uri})
-            break
-            
-    if not model_uri:
-        log.error("Model Missing", extra={"event_type": "MODEL_LOAD", "status": "FAILED"})
-    else:
-        model = mlflow.sklearn.load_model(model_uri)
-        latest_run_id = os.path.basename(os.path.dirname(model_uri))
-        log.info(model_uri)
+    latest = load_latest_model()
+    if latest:
+        model, latest_run_id = latest
         log.info("Model Loaded", extra={"event_type": "MODEL_LOAD", "status": "SUCCESS", "version": latest_run_id})
+    else:
+        search_path = "ml_model"
+        model_uri = load_cached_model_path()
+        if not model_uri:
+            model_uri = find_model(search_path)
+            if model_uri:
+                save_cached_model_path(model_uri)
+        if model_uri:
+            log.info(f"Model Found", extra={"event_type": "MODEL_LOAD", "path": model_uri})
+
+        if not model_uri:
+            log.error("Model Missing", extra={"event_type": "MODEL_LOAD", "status": "FAILED"})
+        else:
+            model = load_model_dir(model_uri)
+            latest_run_id = os.path.basename(os.path.dirname(model_uri))
+            log.info(model_uri)
+            log.info("Model Loaded", extra={"event_type": "MODEL_LOAD", "status": "SUCCESS", "version": latest_run_id})
+
+    if model:
+        try:
+            fast_scorer = LinearTextScorer(model)
+            fast_scorer.warm_up()
+        except ValueError as e:
+            log.info(f"Fast scorer unavailable, using pipeline predict: {e}", extra={"event_type": "MODEL_LOAD"})
 
 except Exception as e:
     log.error(f"Model Load Error: {e}", extra={"event_type": "MODEL_LOAD", "status": "CRASH"})
     model = None
 
+# The IMDB labels are lowercase; the other casings are accepted without a per-request lower()
+POSITIVE_LABELS = frozenset(("positive", "Positive", "POSITIVE"))
+
+# --- PREDICTION BATCHING ---
+# Concurrent /submit_review calls are scored together so the vectorizer overhead is paid once per batch
+PREDICT_BATCH_SIZE = 32
+PREDICT_BATCH_WINDOW = 0.005  # seconds
+
+# Queue of (text, future) pairs; created on startup since Python 3.9 binds it to the current loop
+prediction_queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = None
+prediction_batcher_task = None
+
+async def prediction_batcher():
+    loop = asyncio.get_running_loop()
+    while True:
+        # Sleep until a request arrives, then give others up to the batch window to join it
+        batch = [await prediction_queue.get()]
+        deadline = loop.time() + PREDICT_BATCH_WINDOW
+        while len(batch) < PREDICT_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(prediction_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            # sklearn is CPU-bound; run it in the default executor so the event loop keeps serving
+            predict = fast_scorer.predict if fast_scorer else model.predict
+            predictions = await loop.run_in_executor(None, predict, [text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+async def predict_sentiment(review_text: str):
+    future = asyncio.get_running_loop().create_future()
+    prediction_queue.put_nowait((review_text, future))
+    return await future
+
 # --- DB SEEDING ---
-def seed_database(db: Session):
-    Base.metadata.create_all(bind=engine)
-    if db.query(Movie).count() > 0:
+SEED_LOCK_KEY = 42  # Postgres advisory lock id: with several workers, only one attempts seeding
+SEED_BATCH_SIZE = 1000  # reviews buffered per COPY
+
+async def copy_records(db: AsyncSession, table, columns, records):
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table.name, records=records, columns=columns)
+
+@contextlib.asynccontextmanager
+async def seed_lock():
+    """Yields True if this worker took the seeding lock, False if another worker already holds it."""
+    async with engine.connect() as conn:
+        acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": SEED_LOCK_KEY})
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SEED_LOCK_KEY})
+
+async def seed_database(db: AsyncSession):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(ensure_indexes)
+    # LIMIT 1 stops at the first row instead of counting the whole table
+    if (await db.execute(select(Movie.id).limit(1))).first():
         return
 
     log.info("Seeding Database", extra={"event_type": "DB_SEED", "status": "STARTED"})
     try:
-        with open("data/initial_movies.json", "r") as f:
-            initial_movies = json.load(f)
-        with open("data/initial_reviews.json", "r") as f:
-            initial_reviews_data = json.load(f)
+        # Seed files are parsed incrementally with ijson and written in SEED_BATCH_SIZE batches;
+        # only the movie name -> id map (needed to link reviews) is held for the whole run
+        movie_name_to_id = {}
+        # Core executemany with plain dicts: no ORM objects, no identity map, no per-row flush.
+        # RETURNING hands back the generated ids, so no second SELECT over movies is needed
+        insert_movies = insert(Movie).returning(Movie.id, Movie.name)
+        movie_rows = []
+        with open("data/initial_movies.json", "rb") as f:
+            for m in ijson.items(f, "item"):
+                movie_rows.append({"name": m['name'], "description": m['desc']})
+                if len(movie_rows) >= SEED_BATCH_SIZE:
+                    movie_name_to_id.update((row.name, row.id) for row in await db.execute(insert_movies, movie_rows))
+                    movie_rows = []
+        if movie_rows:
+            movie_name_to_id.update((row.name, row.id) for row in await db.execute(insert_movies, movie_rows))
+
+        # Reviews need nothing back, so stream them with COPY ... FROM STDIN (binary, no escaping)
+        # on the session's own connection, inside the same transaction as the movies
+        review_columns = ("movie_id", "review", "isPos")
+        review_records = []
+        with open("data/initial_reviews.json", "rb") as f:
+            for name, review_text, is_positive in ijson.items(f, "item"):
+                movie_id = movie_name_to_id.get(name)
+                if movie_id:
+                    review_records.append((movie_id, review_text, is_positive))
+                if len(review_records) >= SEED_BATCH_SIZE:
+                    await copy_records(db, MovieReview.__table__, review_columns, review_records)
+                    review_records = []
+        if review_records:
+            await copy_records(db, MovieReview.__table__, review_columns, review_records)
+        await db.commit()
     except Exception as e:
+        await db.rollback()
         log.error("Seeding Failed", extra={"event_type": "DB_SEED", "status": "FAILED", "error": str(e)})
         return
+    invalidate_movies_cache()
+    log.info("Seeding Complete", extra={"event_type": "DB_SEED", "status": "SUCCESS", "movies_added": len(movie_name_to_id)})
 
-    movie_objects = [Movie(name=m['name'], description=m['desc']) for m in initial_movies]
-    db.add_all(movie_objects)
-    db.commit()
+async def _ping_connection():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
 
-    movie_name_to_id = {m.name: m.id for m in db.query(Movie).all()}
-    review_objects = []
-    for name, review_text, is_positive in initial_reviews_data:
-        movie_id = movie_name_to_id.get(name)
-        if movie_id:
-            review_objects.append(MovieReview(movie_id=movie_id, review=review_text, isPos=is_positive))
-            
-    db.add_all(review_objects)
-    db.commit()
-    log.info("Seeding Complete", extra={"event_type": "DB_SEED", "status": "SUCCESS", "movies_added": len(movie_objects)})
+async def warm_connection_pool():
+    # Open every pooled connection up front so the first requests skip the TCP + auth handshake
+    await asyncio.gather(*[_ping_connection() for _ in range(DB_POOL_SIZE)])
 
 @app.on_event("startup")
 async def startup_event():
+    global prediction_queue, prediction_batcher_task, movies_cache_lock
+    prediction_queue = asyncio.Queue()
+    prediction_batcher_task = asyncio.create_task(prediction_batcher())
+    movies_cache_lock = asyncio.Lock()
+
     try:
-        db = SessionLocal()
-        seed_database(db)
+        # Losing the lock means another worker is seeding right now: skip the JSON parsing entirely
+        async with seed_lock() as acquired:
+            if acquired:
+                async with SessionLocal() as db:
+                    await seed_database(db)
+        await warm_connection_pool()
     except Exception as e:
         log.error(f"Startup DB Error: {e}")
-    finally:
-        if 'db' in locals() and db:
-            db.close()
 
 # --- ENDPOINTS ---
 
 @app.get("/")
-def home():
+async def home():
     return {"message": "Rotten Potatoes API is running."}
 
+# The catalog only changes when seeded, so /movies is served from memory between refreshes.
+# Entries are keyed on (TTL bucket, version); bumping the version invalidates every cached copy.
+MOVIES_CACHE_TTL = 60  # seconds
+movies_cache = None  # (cache_key, movies)
+movies_cache_version = 0
+movies_cache_lock = None  # created on startup: Python 3.9 binds asyncio.Lock to the loop current at construction
+
+def invalidate_movies_cache():
+    global movies_cache_version
+    movies_cache_version += 1
+
+def movies_cache_key():
+    return (int(time.time() // MOVIES_CACHE_TTL), movies_cache_version)
+
 @app.get("/movies", response_model=List[MovieData])
-def get_all_movies(db: Session = Depends(get_db)):
+async def get_all_movies():
+    global movies_cache
     # NOTE: This message is different ("View Movies List" vs "API Request: Fetching...")
     log.info("View Movies List", extra={"event_type": "TRAFFIC", "endpoint": "/movies"})
-    movies = db.query(Movie).all()
-    return [{"id": m.id, "name": m.name, "description": m.description} for m in movies]
+    key = movies_cache_key()
+    if movies_cache and movies_cache[0] == key:
+        return movies_cache[1]
+
+    # Only one request reloads the catalog; the others wait and reuse its result
+    async with movies_cache_lock:
+        if movies_cache and movies_cache[0] == key:
+            return movies_cache[1]
+
+        db = ScopedSession()
+        # ORM rows are validated straight into the response model (from_attributes).
+        # A server-side cursor fetches them in pages, so the driver never buffers the whole table at once.
+        stream = await db.stream_scalars(select(Movie).execution_options(yield_per=500))
+        movies = [movie async for movie in stream]
+        # An empty catalog means seeding has not finished yet, so it is not worth caching
+        if movies:
+            movies_cache = (key, movies)
+    return movies
 
 @app.get("/score/{movie_id}", response_model=ScoreResponse)
-def get_movie_score(movie_id: int, db: Session = Depends(get_db)):
-    
-    total_reviews = db.query(MovieReview).filter(MovieReview.movie_id == movie_id).count()
-    positive_count = db.query(MovieReview).filter(MovieReview.movie_id == movie_id, MovieReview.isPos == True).count()
+async def get_movie_score(movie_id: int):
+    cached = await get_cached_score(movie_id)
+    if cached:
+        total_reviews, positive_count = cached
+    else:
+        db = ScopedSession()
+        # One pass over the movie's reviews for both counts, served from ix_movie_reviews_movie_id_ispos
+        total_reviews, positive_count = (await db.execute(
+            select(func.count(), func.count().filter(MovieReview.isPos))
+            .where(MovieReview.movie_id == movie_id)
+        )).one()
+        await set_cached_score(movie_id, total_reviews, positive_count)
 
     score = 0.0 if total_reviews == 0 else (positive_count / total_reviews) * 100
 
@@ -212,17 +624,37 @@ def get_movie_score(movie_id: int, db: Session = Depends(get_db)):
 
     return {"total_reviews": total_reviews, "positive_count": positive_count, "score": round(score, 2)}
 
+async def persist_review(movie_id: int, review_text: str, is_positive: bool):
+    """
+    Stores a scored review after the response has gone out. The client is acknowledged before the
+    row is durable: a failed write is only logged, and an immediate re-read may not see the review yet.
+    """
+    async with SessionLocal() as db:
+        try:
+            new_review = MovieReview(movie_id=movie_id, review=review_text, isPos=is_positive)
+            db.add(new_review)
+            # review_id is filled in by the INSERT's RETURNING clause; no refresh round-trip needed
+            await db.commit()
+
+            log.info("Review Saved", extra={"event_type": "DB_WRITE", "status": "SUCCESS", "review_id": new_review.review_id})
+
+        except Exception as e:
+            await db.rollback()
+            log.error(f"Save Failed: {e}", extra={"event_type": "DB_WRITE", "status": "FAILED"})
+            return
+
+    await bump_cached_score(movie_id, is_positive)
+
 @app.post("/submit_review")
-def submit_and_predict_review(review_input: ReviewInput, db: Session = Depends(get_db)):
+async def submit_and_predict_review(review_input: ReviewInput, background_tasks: BackgroundTasks):
     if not model:
         log.error("Model Error", extra={"event_type": "PREDICTION_ERROR", "reason": "Not Loaded"})
         raise HTTPException(status_code=503, detail="Model not loaded.")
 
     # 1. Predict
     try:
-        prediction = model.predict([review_input.text])
-        sentiment = prediction[0]
-        is_positive = sentiment.lower() == "positive"
+        sentiment = await predict_sentiment(review_input.text)
+        is_positive = sentiment in POSITIVE_LABELS
         
         # THIS IS THE MOST IMPORTANT LOG FOR YOUR PIE CHART
         log.info("Prediction Made", extra={
@@ -236,24 +668,16 @@ def submit_and_predict_review(review_input: ReviewInput, db: Session = Depends(g
         log.error(f"Prediction Failed: {e}", extra={"event_type": "PREDICTION_ERROR"})
         raise HTTPException(status_code=500, detail="Prediction service failed.")
 
-    # 2. Save
-    try:
-        new_review = MovieReview(movie_id=review_input.movie_id, review=review_input.text, isPos=is_positive)
-        db.add(new_review)
-        db.commit()
-        db.refresh(new_review)
-        
-        log.info("Review Saved", extra={"event_type": "DB_WRITE", "status": "SUCCESS", "review_id": new_review.review_id})
-        
-    except Exception as e:
-        db.rollback()
-        log.error(f"Save Failed: {e}", extra={"event_type": "DB_WRITE", "status": "FAILED"})
-        raise HTTPException(status_code=500, detail="Review saved failed.")
+    # 2. Save (after the response is sent; the UI only needs the prediction)
+    background_tasks.add_task(persist_review, review_input.movie_id, review_input.text, is_positive)
 
     return {"sentiment": sentiment, "model_version": latest_run_id, "message": "Success"}
 
 @app.get("/reviews/{movie_id}", response_model=List[MovieReviewData])
-def get_reviews(movie_id: int, db: Session = Depends(get_db)):
+async def get_reviews(movie_id: int):
+    db = ScopedSession()
     log.info("View Reviews", extra={"event_type": "TRAFFIC", "endpoint": "/reviews", "movie_id": movie_id})
-    recent_reviews = db.query(MovieReview).filter(MovieReview.movie_id == movie_id).order_by(MovieReview.review_id.desc()).limit(3).all()
-    return [{"review_id": r.review_id, "movie_id": r.movie_id, "review": r.review, "isPos": r.isPos} for r in recent_reviews]
\ No newline at end of file
+    recent_reviews = (await db.execute(
+        select(MovieReview).where(MovieReview.movie_id == movie_id).order_by(MovieReview.review_id.desc()).limit(3)
+    )).scalars().all()
+    return recent_reviews
\ No newline at end of file
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
 
@@ -16,14 +17,54 @@ SUBMIT_REVIEW_URL = f"{API_BASE_URL}/submit_review"
 
 # --- HELPER FUNCTIONS ---
 
+@st.cache_resource
+def get_http_session():
+    """
+    One keep-alive connection pool to the backend, shared across reruns and sessions.
+    Streamlit re-executes this script on every interaction, so a plain module-level
+    Session would be rebuilt (and its connections dropped) each time.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+SESSION = get_http_session()
+
+class BackendError(Exception):
+    """Non-200 reply; raised inside cached fetchers so failures are never cached."""
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.status_code = status_code
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_movies():
+    # The catalog rarely changes, so reruns within 5 minutes reuse the last response
+    response = SESSION.get(MOVIES_URL)
+    if response.status_code != 200:
+        raise BackendError(response.status_code)
+    # Expecting a list of dicts: [{"id": 1, "name": "...", "description": "..."}, ...]
+    return response.json()
+
+def request_recent_reviews(movie_id):
+    response = SESSION.get(f"{REVIEWS_URL}/{movie_id}")
+    if response.status_code != 200:
+        raise BackendError(response.status_code)
+    return response.json()
+
+fetch_recent_reviews = st.cache_data(ttl=10, show_spinner=False)(request_recent_reviews)
+
 def get_movies():
     """Fetches the list of movies from the backend API."""
     try:
-        response = requests.get(MOVIES_URL)
-        if response.status_code == 200:
-            # Expecting a list of dicts: [{"id": 1, "name": "...", "description": "..."}, ...]
-            return response.json()
-        st.error(f"Error fetching movies: {response.status_code}")
+        movies = fetch_movies()
+        if not movies:
+            # The backend may still be seeding; don't hold an empty catalog for the whole TTL
+            fetch_movies.clear()
+        return movies
+    except BackendError as e:
+        st.error(f"Error fetching movies: {e.status_code}")
         return []
     except requests.exceptions.ConnectionError:
         st.error("🚨 Connection Error! We are facing some technical difficulties. Please try again later.")
@@ -40,7 +81,7 @@ def calculate_score_and_status(movies_data, selected_movie_id):
 
     try:
         score_url = f"{API_BASE_URL}/score/{selected_movie_id}"
-        response = requests.get(score_url)
+        response = SESSION.get(score_url)
 
         if response.status_code == 200:
             data = response.json()
@@ -73,10 +114,12 @@ def calculate_score_and_status(movies_data, selected_movie_id):
 def get_recent_reviews(movie_id):
     """Fetches the last N recent reviews for a movie from the backend API."""
     try:
-        review_url = f"{REVIEWS_URL}/{movie_id}"
-        response = requests.get(review_url)
-        if response.status_code == 200:
-            return response.json() 
+        # The backend saves a review after answering the submit, so the rerun right after one can
+        # beat the write; read uncached then, so a list without the new review is not kept for the TTL
+        if st.session_state.pop("skip_reviews_cache", False):
+            return request_recent_reviews(movie_id)
+        return fetch_recent_reviews(movie_id)
+    except BackendError:
         return []
     except requests.exceptions.ConnectionError:
         st.error("🚨 Could not connect to the database.")
@@ -199,7 +242,7 @@ if selected_movie:
             
             try:
                 with st.spinner("Analyzing and Saving Review..."):
-                    response = requests.post(SUBMIT_REVIEW_URL, json=payload)
+                    response = SESSION.post(SUBMIT_REVIEW_URL, json=payload)
                 
                 # 6. DISPLAY RESULTS
                 if response.status_code == 200:
@@ -222,8 +265,10 @@ if selected_movie:
                             }
                         st.session_state.post_submission_message = msg
                         
-                        # Clear the review box
+                        # Clear the review box and drop cached reviews so later reruns show the new one
                         st.session_state.should_clear_review = True
+                        st.session_state.skip_reviews_cache = True
+                        fetch_recent_reviews.clear()
                         st.experimental_rerun() # Rerun to refresh score and clear text area
                 
                     elif "error" in data:
@@ -1,21 +1,24 @@
-import pandas as pd
+import csv
+import shutil
 import sys
+from itertools import islice
 
 def prepare_data(version):
     print(f"Preparing Data Version {version}...")
 
-    # Load the huge original dataset
-    df = pd.read_csv('data/full_dataset.csv')
+    # The huge original dataset is streamed, never fully loaded
+    source = 'data/full_dataset.csv'
 
     if version == 1:
         # VERSION 1: TAKE ONLY 10000 ROWS (Small data for initial deploy)
-        small_df = df.iloc[:10000]
-        small_df.to_csv('data/train.csv', index=False)
-        print("Created 'data/train.csv' with 1,0000 rows.")
+        # csv handles quoted reviews that span several lines; stop reading after the header + 10000 rows
+        with open(source, newline='', encoding='utf-8') as fi, open('data/train.csv', 'w', newline='', encoding='utf-8') as fo:
+            csv.writer(fo, lineterminator='\n').writerows(islice(csv.reader(fi), 10000 + 1))
+        print("Created 'data/train.csv' with 10,000 rows.")
 
     elif version == 2:
         # VERSION 2: TAKE ALL DATA (Simulating 'New Data Arrived')
-        df.to_csv('data/train.csv', index=False)
+        shutil.copyfile(source, 'data/train.csv')
         print("Created 'data/train.csv' with ALL rows.")
 
 if __name__ == "__main__":
@@ -23,4 +26,4 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         prepare_data(int(sys.argv[1]))
     else:
-        print("Please provide a version number (1 or 2)")
\ No newline at end of file
+        print("Please provide a version number (1 or 2)")
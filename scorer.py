@@ -0,0 +1,136 @@
+import math
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the kernel still works, just as an interpreted loop
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Term-frequency and normalisation modes understood by _score
+TF_RAW, TF_BINARY, TF_SUBLINEAR = 0, 1, 2
+NORM_NONE, NORM_L1, NORM_L2 = 0, 1, 2
+
+
+@njit(cache=True, fastmath=True)
+def _score(cols, counts, idf, coef, intercept, tf_mode, norm_mode):
+    """Decision value of one document given its (column, count) pairs."""
+    dot = 0.0
+    norm = 0.0
+    for i in range(cols.shape[0]):
+        col = cols[i]
+        if tf_mode == TF_BINARY:
+            weight = 1.0
+        elif tf_mode == TF_SUBLINEAR:
+            weight = math.log(counts[i]) + 1.0
+        else:
+            weight = float(counts[i])
+        weight *= idf[col]
+        dot += coef[col] * weight
+        if norm_mode == NORM_L2:
+            norm += weight * weight
+        elif norm_mode == NORM_L1:
+            norm += abs(weight)
+
+    # Normalising the document vector scales its dot product by the same factor
+    if norm == 0.0 or norm_mode == NORM_NONE:
+        return intercept + dot
+    if norm_mode == NORM_L2:
+        return intercept + dot / math.sqrt(norm)
+    return intercept + dot / norm
+
+
+try:
+    # Native build of _score produced by aot_build.py at image build time
+    from sentiment_kernel import score as score_kernel
+except ImportError:
+    score_kernel = _score
+
+
+class LinearTextScorer:
+    """
+    Inference shortcut for a vectorizer + binary linear classifier pipeline built by train.py.
+    For TfidfVectorizer models the fitted vocabulary, IDF weights and coefficients are pulled out once
+    at load time, and each text is scored as a sparse dot product: no Pipeline dispatch, no scipy
+    matrix per call. HashingVectorizer models are stateless, so the whole batch is hashed in one
+    transform() and scored with a single sparse matvec.
+    Raises ValueError for pipelines it cannot reproduce exactly, so callers can fall back to predict().
+    """
+
+    def __init__(self, pipeline):
+        steps = getattr(pipeline, "steps", None)
+        if not steps or len(steps) != 2:
+            raise ValueError("expected a two-step vectorizer + classifier pipeline")
+        vectorizer, classifier = steps[0][1], steps[1][1]
+
+        if not isinstance(vectorizer, (TfidfVectorizer, HashingVectorizer)):
+            raise ValueError(f"unsupported vectorizer {type(vectorizer).__name__}")
+        coef = getattr(classifier, "coef_", None)
+        if coef is None or coef.shape[0] != 1 or len(classifier.classes_) != 2:
+            raise ValueError("expected a fitted binary linear classifier")
+
+        self.coef = np.ascontiguousarray(coef.ravel(), dtype=np.float64)
+        self.intercept = float(classifier.intercept_[0])
+        self.classes = classifier.classes_
+        self.hashing_vectorizer = vectorizer if isinstance(vectorizer, HashingVectorizer) else None
+        if self.hashing_vectorizer is not None:
+            return
+
+        if vectorizer.norm not in ("l1", "l2", None):
+            raise ValueError(f"unsupported norm {vectorizer.norm!r}")
+
+        self.analyzer = vectorizer.build_analyzer()
+        # Vocabulary as two parallel arrays sorted by token hash, looked up with one searchsorted per
+        # document instead of a dict probe per token. Python's str hash is salted per process, which is
+        # fine here: the arrays are rebuilt in every process that loads the model.
+        vocabulary = vectorizer.vocabulary_
+        n_vocab = len(vocabulary)
+        hashes = np.fromiter((hash(token) for token in vocabulary), dtype=np.int64, count=n_vocab)
+        cols = np.fromiter(vocabulary.values(), dtype=np.int64, count=n_vocab)
+        if np.unique(hashes).size != n_vocab:
+            raise ValueError("vocabulary hash collision")
+        order = np.argsort(hashes)
+        self.token_hashes = hashes[order]
+        self.token_cols = cols[order]
+        if vectorizer.binary:
+            self.tf_mode = TF_BINARY
+        elif vectorizer.sublinear_tf:
+            self.tf_mode = TF_SUBLINEAR
+        else:
+            self.tf_mode = TF_RAW
+        self.norm_mode = {None: NORM_NONE, "l1": NORM_L1, "l2": NORM_L2}[vectorizer.norm]
+        idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(n_vocab)
+        self.idf = np.ascontiguousarray(idf, dtype=np.float64)
+
+    def decision_function(self, text):
+        tokens = self.analyzer(text)
+        if not tokens:
+            return self.intercept
+
+        hashed = np.fromiter((hash(token) for token in tokens), dtype=np.int64, count=len(tokens))
+        idx = np.searchsorted(self.token_hashes, hashed)
+        np.minimum(idx, len(self.token_hashes) - 1, out=idx)
+        # Out-of-vocabulary tokens land on a neighbouring entry whose hash does not match
+        in_vocab = self.token_hashes[idx] == hashed
+        if not in_vocab.any():
+            return self.intercept
+
+        cols, token_counts = np.unique(self.token_cols[idx[in_vocab]], return_counts=True)
+        return score_kernel(cols, token_counts.astype(np.int64), self.idf, self.coef, self.intercept, self.tf_mode, self.norm_mode)
+
+    def warm_up(self):
+        """Runs the kernel once so any JIT compilation (or on-disk cache load) happens at startup."""
+        if self.hashing_vectorizer is not None:
+            return
+        one = np.zeros(1, dtype=np.int64)
+        score_kernel(one, one + 1, self.idf, self.coef, self.intercept, self.tf_mode, self.norm_mode)
+
+    def predict(self, texts):
+        if self.hashing_vectorizer is not None:
+            scores = self.hashing_vectorizer.transform(texts) @ self.coef + self.intercept
+        else:
+            scores = np.array([self.decision_function(text) for text in texts])
+        return np.where(scores > 0, self.classes[1], self.classes[0])
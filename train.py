@@ -1,55 +1,125 @@
+import json
+import os
+import tempfile
+
+import joblib
+import numpy as np
 import pandas as pd
 import mlflow
 import mlflow.sklearn
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import make_pipeline
-from sklearn.metrics import accuracy_score, classification_report
+from sklearn.metrics import accuracy_score
+
+DATA_PATH = "data/train.csv"
+# Which model ships:
+#   in_memory -> TF-IDF + LogisticRegression fitted on the whole file (most accurate)
+#   streaming -> Hashing + SGDClassifier learned chunk by chunk (flat memory, less accurate)
+#   auto      -> in_memory for files up to IN_MEMORY_MAX_BYTES (the IMDB CSV included), else streaming
+TRAINING_MODE = os.getenv("TRAINING_MODE", "auto")
+IN_MEMORY_MAX_BYTES = 512 * 1024 ** 2
+CHUNK_SIZE = 50_000
+N_FEATURES = 2 ** 20
+N_EPOCHS = 5
+SGD_ALPHA = 1e-5
+TEST_SIZE = 0.2
+CLASSES = np.array(["negative", "positive"])
+# Read by app.py on startup so it can load this run's model without searching the artifact tree
+LATEST_MODEL_FILE = "latest_model.json"
 
 # SET EXPERIMENT NAME
 mlflow.set_experiment("IMDB_Sentiment_Analysis")
 
-def train():
-    with mlflow.start_run():
-        # 1. READ DATA (DVC ensures this is the right version)
-        print("Reading data...")
-        df = pd.read_csv("data/train.csv")
+def train_in_memory():
+    # 1. READ DATA (DVC ensures this is the right version)
+    # The dataset has columns 'review' and 'sentiment'
+    df = pd.read_csv(DATA_PATH, usecols=["review", "sentiment"])
+    X_train, X_test, y_train, y_test = train_test_split(df["review"], df["sentiment"], test_size=TEST_SIZE, random_state=42)
 
-        # The dataset has columns 'review' and 'sentiment'
-        # (Note: The downloaded dataset might use 'Review' or 'text', checking header...)
-        # We assume columns are 'Review' and 'Sentiment' based on the source link.
-        # If the CSV has different headers, print df.columns to check.
+    # 2. DEFINE MODEL (TF-IDF + Logistic Regression is great for text)
+    mlflow.log_param("vectorizer", "Tfidf")
+    mlflow.log_param("model", "LogisticRegression")
+    pipe = make_pipeline(TfidfVectorizer(), LogisticRegression())
 
-        X = df['review'] 
-        y = df['sentiment']
+    # 3. TRAIN + EVALUATE
+    print("Training...")
+    pipe.fit(X_train, y_train)
+    acc = accuracy_score(y_test, pipe.predict(X_test))
+    return pipe, acc
 
-        # 2. SPLIT
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+def iter_split_chunks():
+    # Re-seeded on every pass so each row lands on the same side of the split in every epoch
+    rng = np.random.RandomState(42)
+    for chunk in pd.read_csv(DATA_PATH, chunksize=CHUNK_SIZE, usecols=["review", "sentiment"]):
+        test_mask = rng.rand(len(chunk)) < TEST_SIZE
+        yield chunk[~test_mask], chunk[test_mask]
 
-        # 3. DEFINE MODEL (TF-IDF + Logistic Regression is great for text)
-        # Log parameters
-        mlflow.log_param("vectorizer", "Tfidf")
-        mlflow.log_param("model", "LogisticRegression")
+def train_streaming():
+    # 1. DEFINE MODEL (Hashing + SGD logistic regression learns chunk by chunk)
+    mlflow.log_param("vectorizer", "Hashing")
+    mlflow.log_param("n_features", N_FEATURES)
+    mlflow.log_param("model", "SGDClassifier(log_loss)")
+    mlflow.log_param("alpha", SGD_ALPHA)
+    mlflow.log_param("chunk_size", CHUNK_SIZE)
+    mlflow.log_param("epochs", N_EPOCHS)
+    # The hashing trick needs no vocabulary, so memory stays flat however big the CSV gets
+    vectorizer = HashingVectorizer(n_features=N_FEATURES, alternate_sign=False)
+    clf = SGDClassifier(loss="log_loss", alpha=SGD_ALPHA, random_state=42)
 
-        pipe = make_pipeline(TfidfVectorizer(), LogisticRegression())
+    # 2. TRAIN: several passes over the CSV, rows shuffled within each chunk
+    print("Training...")
+    shuffle_rng = np.random.RandomState(0)
+    for _ in range(N_EPOCHS):
+        for train_rows, _test_rows in iter_split_chunks():
+            train_rows = train_rows.iloc[shuffle_rng.permutation(len(train_rows))]
+            clf.partial_fit(vectorizer.transform(train_rows["review"]), train_rows["sentiment"], classes=CLASSES)
 
-        # 4. TRAIN
-        print("Training...")
-        pipe.fit(X_train, y_train)
+    # 3. EVALUATE on the held-out rows of every chunk
+    correct, tested = 0, 0
+    for _train_rows, test_rows in iter_split_chunks():
+        if len(test_rows):
+            preds = clf.predict(vectorizer.transform(test_rows["review"]))
+            correct += int((preds == test_rows["sentiment"].to_numpy()).sum())
+            tested += len(test_rows)
+    acc = correct / tested if tested else 0.0
+    return make_pipeline(vectorizer, clf), acc
 
-        # 5. EVALUATE
-        preds = pipe.predict(X_test)
-        acc = accuracy_score(y_test, preds)
-        print(f"Accuracy: {acc}")
+def resolve_training_mode():
+    if TRAINING_MODE == "auto":
+        return "in_memory" if os.path.getsize(DATA_PATH) <= IN_MEMORY_MAX_BYTES else "streaming"
+    if TRAINING_MODE not in ("in_memory", "streaming"):
+        raise ValueError(f"TRAINING_MODE must be auto, in_memory or streaming, not {TRAINING_MODE!r}")
+    return TRAINING_MODE
 
-        # Log metrics
+def train():
+    with mlflow.start_run():
+        mode = resolve_training_mode()
+        mlflow.log_param("training_mode", mode)
+        pipe, acc = train_in_memory() if mode == "in_memory" else train_streaming()
+        print(f"Accuracy ({mode}): {acc}")
+
+        # Log metrics (always the accuracy of the model that ships)
         mlflow.log_metric("accuracy", acc)
 
-        # 6. REGISTER MODEL
-        # This saves the model file into the MLflow system
-        mlflow.sklearn.log_model(pipe, "model")
+        # 4. REGISTER MODEL
+        # This saves the model file into the MLflow system. The directory is built locally and logged
+        # whole so the joblib copy the API memory-maps sits next to model.pkl (MLflow 3's log_model
+        # writes to a separate model store that run artifacts never reach)
+        run_id = mlflow.active_run().info.run_id
+        with tempfile.TemporaryDirectory() as tmp:
+            model_dir = os.path.join(tmp, "model")
+            mlflow.sklearn.save_model(pipe, model_dir)
+            joblib.dump(pipe, os.path.join(model_dir, "model.joblib"))
+            mlflow.log_artifacts(model_dir, artifact_path="model")
+        model_uri = f"runs:/{run_id}/model"
         print("Model saved to MLflow")
 
+        # 5. POINT THE API AT THIS RUN
+        with open(LATEST_MODEL_FILE, "w") as f:
+            json.dump({"run_id": run_id, "model_uri": model_uri}, f)
+        print(f"Recorded {model_uri} in {LATEST_MODEL_FILE}")
+
 if __name__ == "__main__":
     train()
\ No newline at end of file